@@ -67,7 +67,7 @@ class ModelProviderService {
     return response.json();
   }
 
-  async createProvider(provider: Omit<ModelProvider, 'id' | 'has_api_key'>): Promise<{ id: string; message: string }> {
+  async createProvider(provider: Omit<ModelProvider, 'id' | 'has_api_key'>): Promise<ModelProvider & { message: string }> {
     const response = await fetch(`${this.baseUrl}/`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
@@ -124,7 +124,7 @@ class ModelProviderService {
   async createProviderModel(
     providerId: string,
     model: Omit<ProviderModel, 'id' | 'provider_id'>
-  ): Promise<{ id: string; message: string }> {
+  ): Promise<ProviderModel & { message: string }> {
     const response = await fetch(`${this.baseUrl}/${providerId}/models`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
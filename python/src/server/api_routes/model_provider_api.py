@@ -2,23 +2,48 @@
 Model Provider API Routes
 
 Provides REST API endpoints for managing model providers and their models.
+
+Handlers stay `async def`: model_provider_service runs each blocking
+supabase-py query in a worker thread (asyncio.to_thread), as do the
+credential_service settings reads and writes behind the model selection
+endpoints, so independent lookups can overlap on the event loop.
 """
 
-from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel, Field
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, List, Optional
+
+import orjson
+from fastapi import APIRouter, HTTPException, Depends, Header, Response
+from fastapi import status as http_status
+from fastapi.responses import ORJSONResponse
+from postgrest.exceptions import APIError
+from pydantic import BaseModel, ConfigDict, Field
 
 from ..config.logfire_config import get_logger
 from ..services.model_provider_service import model_provider_service, ModelProvider, ProviderModel
+from ..services.llm_provider_service_new import invalidate_caches
+from ..utils.etag_utils import check_etag
 
 logger = get_logger(__name__)
 
 # Create router
-router = APIRouter(prefix="/api/model-providers", tags=["Model Providers"])
+router = APIRouter(
+    prefix="/api/model-providers",
+    tags=["Model Providers"],
+    default_response_class=ORJSONResponse,
+)
 
 
 # Pydantic models for API
+# Request models are immutable once validated. Unknown keys are ignored rather
+# than forbidden because the UI posts back full objects (id, has_api_key, ...).
+_REQUEST_MODEL_CONFIG = ConfigDict(extra="ignore", frozen=True)
+
+
 class ModelProviderRequest(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     name: str = Field(..., description="Provider name (lowercase, no spaces)")
     display_name: str = Field(..., description="Display name for the provider")
     base_url: Optional[str] = Field(None, description="Base URL for the provider API")
@@ -42,6 +67,8 @@ class ModelProviderResponse(BaseModel):
 
 
 class ProviderModelRequest(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     model_id: str = Field(..., description="Model identifier used by the provider")
     model_name: str = Field(..., description="Human-readable model name")
     model_type: str = Field(..., description="Type of model: 'chat' or 'embedding'")
@@ -68,6 +95,8 @@ class ProviderModelResponse(BaseModel):
 
 
 class ModelSelectionRequest(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+
     chat_provider_id: str = Field(..., description="Provider ID for chat model")
     chat_model_id: str = Field(..., description="Model ID for chat model")
     embedding_provider_id: str = Field(..., description="Provider ID for embedding model")
@@ -81,58 +110,119 @@ class SelectedModelsResponse(BaseModel):
     embedding_model: Optional[ProviderModelResponse] = None
 
 
-def _convert_provider_to_response(provider: ModelProvider) -> ModelProviderResponse:
-    """Convert ModelProvider to API response format."""
-    return ModelProviderResponse(
-        id=provider.id,
-        name=provider.name,
-        display_name=provider.display_name,
-        base_url=provider.base_url,
-        has_api_key=bool(provider.api_key),
-        requires_api_key=provider.requires_api_key,
-        is_active=provider.is_active,
-        provider_type=provider.provider_type,
-        description=provider.description
-    )
-
-
-def _convert_model_to_response(model: ProviderModel) -> ProviderModelResponse:
-    """Convert ProviderModel to API response format."""
-    return ProviderModelResponse(
-        id=model.id,
-        provider_id=model.provider_id,
-        model_id=model.model_id,
-        model_name=model.model_name,
-        model_type=model.model_type,
-        is_default=model.is_default,
-        is_active=model.is_active,
-        max_tokens=model.max_tokens,
-        cost_per_token_input=model.cost_per_token_input,
-        cost_per_token_output=model.cost_per_token_output,
-        description=model.description
-    )
+class ProviderWithModelsResponse(BaseModel):
+    provider: ModelProviderResponse
+    models: List[ProviderModelResponse] = []
+
+
+# Response fields are listed explicitly rather than copied from the dataclass so
+# that api_key, configuration, and any future internal field can never leak.
+def _provider_to_dict(provider: ModelProvider) -> dict:
+    """Build the JSON-ready dict for a provider without Pydantic validation."""
+    return {
+        "id": provider.id,
+        "name": provider.name,
+        "display_name": provider.display_name,
+        "base_url": provider.base_url,
+        "has_api_key": bool(provider.api_key),
+        "requires_api_key": provider.requires_api_key,
+        "is_active": provider.is_active,
+        "provider_type": provider.provider_type,
+        "description": provider.description,
+    }
+
+
+def _model_to_dict(model: ProviderModel) -> dict:
+    """Build the JSON-ready dict for a provider model without Pydantic validation."""
+    return {
+        "id": model.id,
+        "provider_id": model.provider_id,
+        "model_id": model.model_id,
+        "model_name": model.model_name,
+        "model_type": model.model_type,
+        "is_default": model.is_default,
+        "is_active": model.is_active,
+        "max_tokens": model.max_tokens,
+        "cost_per_token_input": model.cost_per_token_input,
+        "cost_per_token_output": model.cost_per_token_output,
+        "description": model.description,
+    }
+
+
+def _encode_json(data: Any) -> tuple[bytes, str]:
+    """Encode data once with orjson and derive its ETag from those same bytes."""
+    # Sorted keys keep the bytes, and therefore the ETag, stable across dict orderings
+    body = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    return body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _etag_response(data: Any, if_none_match: Optional[str]) -> Response:
+    """Return data as JSON with an ETag, or an empty 304 if the client's copy is current."""
+    body, current_etag = _encode_json(data)
+    headers = {"ETag": current_etag, "Cache-Control": "no-cache, must-revalidate"}
+    if check_etag(if_none_match, current_etag):
+        return Response(status_code=http_status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Utility endpoints
+# These lists are fixed per deployment, so their bodies and ETags are computed
+# once at import and clients may cache them for a day. They are registered
+# before the /{provider_id}/... routes, which would otherwise capture
+# /types/models as provider_id="types".
+_MODEL_TYPES = ["chat", "embedding"]
+_PROVIDER_TYPES = ["openai_compatible", "custom"]
+_MODEL_TYPES_BODY, _MODEL_TYPES_ETAG = _encode_json(_MODEL_TYPES)
+_PROVIDER_TYPES_BODY, _PROVIDER_TYPES_ETAG = _encode_json(_PROVIDER_TYPES)
+_STATIC_CACHE_CONTROL = "public, max-age=86400, immutable"
+
+
+def _static_response(body: bytes, etag: str, if_none_match: Optional[str]) -> Response:
+    """Return a precomputed JSON body with long-lived caching headers."""
+    headers = {"ETag": etag, "Cache-Control": _STATIC_CACHE_CONTROL}
+    if check_etag(if_none_match, etag):
+        return Response(status_code=http_status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/types/models", response_model=None, responses={200: {"model": List[str]}})
+async def get_model_types(if_none_match: str | None = Header(None)) -> Response:
+    """Get available model types."""
+    return _static_response(_MODEL_TYPES_BODY, _MODEL_TYPES_ETAG, if_none_match)
+
+
+@router.get("/types/providers", response_model=None, responses={200: {"model": List[str]}})
+async def get_provider_types(if_none_match: str | None = Header(None)) -> Response:
+    """Get available provider types."""
+    return _static_response(_PROVIDER_TYPES_BODY, _PROVIDER_TYPES_ETAG, if_none_match)
 
 
 # Provider management endpoints
-@router.get("/", response_model=List[ModelProviderResponse])
-async def get_providers(include_inactive: bool = False):
+# Read endpoints return pre-built dicts encoded once by _etag_response: the data comes
+# from our own service layer, so response_model validation is skipped and the
+# response models are only referenced for the OpenAPI schema.
+@router.get("/", response_model=None, responses={200: {"model": List[ModelProviderResponse]}})
+async def get_providers(
+    include_inactive: bool = False,
+    if_none_match: str | None = Header(None)
+) -> Response:
     """Get all model providers."""
     try:
         providers = await model_provider_service.get_all_providers(include_inactive)
-        return [_convert_provider_to_response(p) for p in providers]
+        return _etag_response([_provider_to_dict(p) for p in providers], if_none_match)
     except Exception as e:
         logger.error(f"Error getting providers: {e}")
         raise HTTPException(status_code=500, detail="Failed to get providers")
 
 
-@router.get("/{provider_id}", response_model=ModelProviderResponse)
-async def get_provider(provider_id: str):
+@router.get("/{provider_id}", response_model=None, responses={200: {"model": ModelProviderResponse}})
+async def get_provider(provider_id: str, if_none_match: str | None = Header(None)) -> Response:
     """Get a specific provider."""
     try:
         provider = await model_provider_service.get_provider_by_id(provider_id)
         if not provider:
             raise HTTPException(status_code=404, detail="Provider not found")
-        return _convert_provider_to_response(provider)
+        return _etag_response(_provider_to_dict(provider), if_none_match)
     except HTTPException:
         raise
     except Exception as e:
@@ -156,8 +246,9 @@ async def create_provider(request: ModelProviderRequest):
             description=request.description
         )
         
-        provider_id = await model_provider_service.create_provider(provider)
-        return {"id": provider_id, "message": "Provider created successfully"}
+        created = await model_provider_service.create_provider(provider)
+        invalidate_caches()
+        return {**_provider_to_dict(created), "message": "Provider created successfully"}
         
     except Exception as e:
         logger.error(f"Error creating provider: {e}")
@@ -186,6 +277,7 @@ async def update_provider(provider_id: str, request: ModelProviderRequest):
         )
         
         success = await model_provider_service.update_provider(provider)
+        invalidate_caches()
         if not success:
             raise HTTPException(status_code=500, detail="Failed to update provider")
             
@@ -203,6 +295,7 @@ async def delete_provider(provider_id: str):
     """Delete a provider."""
     try:
         success = await model_provider_service.delete_provider(provider_id)
+        invalidate_caches()
         if not success:
             raise HTTPException(status_code=500, detail="Failed to delete provider")
             
@@ -214,23 +307,53 @@ async def delete_provider(provider_id: str):
 
 
 # Model management endpoints
-@router.get("/{provider_id}/models", response_model=List[ProviderModelResponse])
+@router.get("/{provider_id}/models", response_model=None, responses={200: {"model": List[ProviderModelResponse]}})
 async def get_provider_models(
     provider_id: str, 
     model_type: Optional[str] = None,
-    include_inactive: bool = False
-):
+    include_inactive: bool = False,
+    if_none_match: str | None = Header(None)
+) -> Response:
     """Get models for a provider."""
     try:
         models = await model_provider_service.get_provider_models(
             provider_id, model_type, include_inactive
         )
-        return [_convert_model_to_response(m) for m in models]
+        return _etag_response([_model_to_dict(m) for m in models], if_none_match)
     except Exception as e:
         logger.error(f"Error getting models for provider {provider_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to get provider models")
 
 
+@router.get("/{provider_id}/full", response_model=None, responses={200: {"model": ProviderWithModelsResponse}})
+async def get_provider_with_models(
+    provider_id: str,
+    model_type: Optional[str] = None,
+    include_inactive: bool = False,
+    if_none_match: str | None = Header(None)
+) -> Response:
+    """Get a provider together with its models in a single request."""
+    try:
+        provider, models = await asyncio.gather(
+            model_provider_service.get_provider_by_id(provider_id),
+            model_provider_service.get_provider_models(provider_id, model_type, include_inactive),
+        )
+        if not provider:
+            raise HTTPException(status_code=404, detail="Provider not found")
+        return _etag_response(
+            {
+                "provider": _provider_to_dict(provider),
+                "models": [_model_to_dict(m) for m in models],
+            },
+            if_none_match,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting provider {provider_id} with models: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get provider")
+
+
 @router.post("/{provider_id}/models", response_model=dict)
 async def create_provider_model(provider_id: str, request: ProviderModelRequest):
     """Create a new model for a provider."""
@@ -249,8 +372,9 @@ async def create_provider_model(provider_id: str, request: ProviderModelRequest)
             description=request.description
         )
         
-        model_id = await model_provider_service.create_provider_model(model)
-        return {"id": model_id, "message": "Model created successfully"}
+        created = await model_provider_service.create_provider_model(model)
+        invalidate_caches()
+        return {**_model_to_dict(created), "message": "Model created successfully"}
         
     except Exception as e:
         logger.error(f"Error creating model for provider {provider_id}: {e}")
@@ -280,6 +404,7 @@ async def update_provider_model(
         )
         
         success = await model_provider_service.update_provider_model(model)
+        invalidate_caches()
         if not success:
             raise HTTPException(status_code=500, detail="Failed to update model")
             
@@ -295,6 +420,7 @@ async def delete_provider_model(provider_id: str, model_id: str):
     """Delete a model."""
     try:
         success = await model_provider_service.delete_provider_model(model_id)
+        invalidate_caches()
         if not success:
             raise HTTPException(status_code=500, detail="Failed to delete model")
             
@@ -306,20 +432,37 @@ async def delete_provider_model(provider_id: str, model_id: str):
 
 
 # Model selection endpoints
-@router.get("/selection/current", response_model=SelectedModelsResponse)
-async def get_selected_models():
+_Selection = tuple[Optional[ModelProvider], Optional[ProviderModel]]
+
+
+async def _selected_or_none(model_type: str, lookup: Callable[[], Awaitable[_Selection]]) -> _Selection:
+    """Await a selection lookup, treating a failed database query as no selection."""
+    # Installs without the model provider tables have no selection rather than an error
+    try:
+        return await lookup()
+    except APIError as e:
+        logger.warning(f"Could not load selected {model_type} model: {e}")
+        return None, None
+
+
+@router.get("/selection/current", response_model=None, responses={200: {"model": SelectedModelsResponse}})
+async def get_selected_models(if_none_match: str | None = Header(None)) -> Response:
     """Get currently selected chat and embedding models."""
     try:
-        chat_provider, chat_model = await model_provider_service.get_selected_chat_model()
-        embedding_provider, embedding_model = await model_provider_service.get_selected_embedding_model()
-        
-        return SelectedModelsResponse(
-            chat_provider=_convert_provider_to_response(chat_provider) if chat_provider else None,
-            chat_model=_convert_model_to_response(chat_model) if chat_model else None,
-            embedding_provider=_convert_provider_to_response(embedding_provider) if embedding_provider else None,
-            embedding_model=_convert_model_to_response(embedding_model) if embedding_model else None
+        # Chat and embedding selections are independent lookups
+        (chat_provider, chat_model), (embedding_provider, embedding_model) = await asyncio.gather(
+            _selected_or_none("chat", model_provider_service.get_selected_chat_model),
+            _selected_or_none("embedding", model_provider_service.get_selected_embedding_model),
         )
         
+        selected = {
+            "chat_provider": _provider_to_dict(chat_provider) if chat_provider else None,
+            "chat_model": _model_to_dict(chat_model) if chat_model else None,
+            "embedding_provider": _provider_to_dict(embedding_provider) if embedding_provider else None,
+            "embedding_model": _model_to_dict(embedding_model) if embedding_model else None,
+        }
+        return _etag_response(selected, if_none_match)
+        
     except Exception as e:
         logger.error(f"Error getting selected models: {e}")
         raise HTTPException(status_code=500, detail="Failed to get selected models")
@@ -329,14 +472,14 @@ async def get_selected_models():
 async def set_selected_models(request: ModelSelectionRequest):
     """Set the selected chat and embedding models."""
     try:
-        # Set chat model
-        chat_success = await model_provider_service.set_selected_chat_model(
-            request.chat_provider_id, request.chat_model_id
-        )
-        
-        # Set embedding model
-        embedding_success = await model_provider_service.set_selected_embedding_model(
-            request.embedding_provider_id, request.embedding_model_id
+        # Chat and embedding selections are independent writes
+        chat_success, embedding_success = await asyncio.gather(
+            model_provider_service.set_selected_chat_model(
+                request.chat_provider_id, request.chat_model_id
+            ),
+            model_provider_service.set_selected_embedding_model(
+                request.embedding_provider_id, request.embedding_model_id
+            ),
         )
         
         if not chat_success or not embedding_success:
@@ -350,15 +493,3 @@ async def set_selected_models(request: ModelSelectionRequest):
         logger.error(f"Error setting selected models: {e}")
         raise HTTPException(status_code=500, detail="Failed to set selected models")
 
-
-# Utility endpoints
-@router.get("/types/models", response_model=List[str])
-async def get_model_types():
-    """Get available model types."""
-    return ["chat", "embedding"]
-
-
-@router.get("/types/providers", response_model=List[str])
-async def get_provider_types():
-    """Get available provider types."""
-    return ["openai_compatible", "custom"]
\ No newline at end of file
@@ -155,6 +155,14 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             api_logger.warning("Could not cleanup background task manager", error=str(e))
 
+        # Close pooled OpenAI-compatible clients
+        try:
+            from .services.model_provider_service import model_provider_service
+
+            await model_provider_service.close()
+        except Exception as e:
+            api_logger.warning("Could not close model provider clients", error=str(e))
+
         api_logger.info("✅ Cleanup completed")
 
     except Exception as e:
@@ -5,6 +5,7 @@ Handles loading, storing, and accessing credentials with encryption for sensitiv
 Credentials include API keys, service credentials, and application configuration.
 """
 
+import asyncio
 import base64
 import os
 import re
@@ -126,8 +127,8 @@ class CredentialService:
         try:
             supabase = self._get_supabase_client()
 
-            # Fetch all credentials
-            result = supabase.table("archon_settings").select("*").execute()
+            # Fetch all credentials; execute() is synchronous, so keep it off the event loop
+            result = await asyncio.to_thread(supabase.table("archon_settings").select("*").execute)
 
             credentials = {}
             for item in result.data:
@@ -174,6 +175,14 @@ class CredentialService:
 
         return value
 
+    async def get_credentials(self, keys: list[str], default: Any = None) -> dict[str, Any]:
+        """Get several credential values at once, keyed by credential key."""
+        if not self._cache_initialized:
+            await self.load_all_credentials()
+
+        # The cache is warm now, so each lookup is an in-memory read
+        return {key: await self.get_credential(key, default) for key in keys}
+
     async def get_encrypted_credential_raw(self, key: str) -> str | None:
         """Get the raw encrypted value for a credential (without decryption)."""
         if not self._cache_initialized:
@@ -248,6 +257,39 @@ class CredentialService:
             logger.error(f"Error setting credential {key}: {e}")
             return False
 
+    async def set_credentials(self, values: dict[str, str], category: str = None) -> bool:
+        """Set several plain (unencrypted) credentials with a single upsert."""
+        try:
+            supabase = self._get_supabase_client()
+
+            rows = [
+                {
+                    "key": key,
+                    "value": value,
+                    "encrypted_value": None,
+                    "is_encrypted": False,
+                    "category": category,
+                    "description": None,
+                }
+                for key, value in values.items()
+            ]
+            await asyncio.to_thread(supabase.table("archon_settings").upsert(rows, on_conflict="key").execute)
+
+            # Only update the cache once the write has landed
+            self._cache.update(values)
+
+            if category == "rag_strategy":
+                self._rag_settings_cache = None
+                self._rag_cache_timestamp = None
+                logger.debug(f"Invalidated RAG settings cache due to update of {', '.join(values)}")
+
+            logger.info(f"Successfully stored credentials: {', '.join(values)}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error setting credentials {', '.join(values)}: {e}")
+            return False
+
     async def delete_credential(self, key: str) -> bool:
         """Delete a credential."""
         try:
@@ -403,17 +445,21 @@ class CredentialService:
             Dict with provider, api_key, base_url, and models
         """
         try:
-            # Import here to avoid circular import
-            from .model_provider_service import ModelProviderService
-            
-            model_provider_service = ModelProviderService()
+            # Import here to avoid circular import; use the shared instance so its caches apply
+            from .model_provider_service import model_provider_service
             
             # Get selected models from RAG settings
             rag_settings = await self.get_credentials_by_category("rag_strategy")
             
+            # Installs without the model provider tables make these lookups raise;
+            # treat that like "nothing selected" so the settings-based config below still applies
             if service_type == "embedding":
                 # Use the dedicated method to get selected embedding model
-                provider, model = await model_provider_service.get_selected_embedding_model()
+                try:
+                    provider, model = await model_provider_service.get_selected_embedding_model()
+                except Exception as e:
+                    logger.warning(f"Could not load selected embedding model: {e}")
+                    provider, model = None, None
                 if provider and model:
                     return {
                         "provider": provider.name,
@@ -425,7 +471,11 @@ class CredentialService:
             
             else:  # service_type == "llm"
                 # Use the dedicated method to get selected chat model
-                provider, model = await model_provider_service.get_selected_chat_model()
+                try:
+                    provider, model = await model_provider_service.get_selected_chat_model()
+                except Exception as e:
+                    logger.warning(f"Could not load selected chat model: {e}")
+                    provider, model = None, None
                 if provider and model:
                     return {
                         "provider": provider.name,
@@ -6,37 +6,79 @@ the new flexible model provider system. This service acts as a compatibility
 layer for existing code while using the new model_provider_service backend.
 """
 
-import time
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from typing import Any, Optional
 
-import openai
+from cachetools import TTLCache
 
 from ..config.logfire_config import get_logger
-from .model_provider_service import model_provider_service
+from .model_provider_service import ModelProvider, ProviderModel, _client_api_key, model_provider_service
 
 logger = get_logger(__name__)
 
-# Settings cache with TTL
-_settings_cache: dict[str, tuple[Any, float]] = {}
+# OpenAI model IDs returned when no provider/model can be resolved
+_DEFAULT_CHAT_MODEL = "gpt-4"
+_DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+@dataclass(frozen=True, slots=True)
+class ModelInfo:
+    """Model details yielded alongside the client by get_llm_client."""
+    model_id: str
+    model_name: str
+    provider_name: str
+    provider_display_name: str
+    max_tokens: int | None
+    model_type: str
+
+
+# Settings cache with TTL (bounded; TTLCache expires entries on its monotonic clock)
 _CACHE_TTL_SECONDS = 300  # 5 minutes
+_CACHE_MAX_ENTRIES = 256
+_settings_cache: TTLCache = TTLCache(maxsize=_CACHE_MAX_ENTRIES, ttl=_CACHE_TTL_SECONDS)
+
+# Lookup indexes rebuilt whenever the matching _settings_cache entry is refreshed
+_providers_by_name: dict[str, ModelProvider] = {}
+_default_models: dict[str, ProviderModel | None] = {}
 
 
 def _get_cached_settings(key: str) -> Any | None:
     """Get cached settings if not expired."""
-    if key in _settings_cache:
-        value, timestamp = _settings_cache[key]
-        if time.time() - timestamp < _CACHE_TTL_SECONDS:
-            return value
-        else:
-            # Expired, remove from cache
-            del _settings_cache[key]
-    return None
+    return _settings_cache.get(key)
 
 
 def _set_cached_settings(key: str, value: Any) -> None:
-    """Cache settings with current timestamp."""
-    _settings_cache[key] = (value, time.time())
+    """Cache settings until the TTL expires."""
+    _settings_cache[key] = value
+
+
+def invalidate_caches() -> None:
+    """Drop all cached provider and model lookups (call after provider/model writes)."""
+    _settings_cache.clear()
+    _providers_by_name.clear()
+    _default_models.clear()
+
+
+async def _get_provider_by_name(provider_name: str) -> ModelProvider | None:
+    """Find an active provider by name, served from the settings cache when fresh."""
+    global _providers_by_name
+
+    if _get_cached_settings("all_providers") is None:
+        providers = await model_provider_service.get_all_providers()
+        _set_cached_settings("all_providers", providers)
+        _providers_by_name = {p.name: p for p in providers}
+    return _providers_by_name.get(provider_name)
+
+
+async def _get_default_provider_model(provider_id: str, model_type: str) -> ProviderModel | None:
+    """Get a provider's default model of one type (or its first model), served from the settings cache when fresh."""
+    cache_key = f"models:{provider_id}:{model_type}"
+    if _get_cached_settings(cache_key) is None:
+        # The settings entry only tracks freshness, since the model itself may be None
+        _default_models[cache_key] = await model_provider_service.get_default_provider_model(provider_id, model_type)
+        _set_cached_settings(cache_key, True)
+    return _default_models.get(cache_key)
 
 
 @asynccontextmanager
@@ -54,27 +96,24 @@ async def get_llm_client(provider_name: str | None = None, use_embedding_provide
     Yields:
         tuple: (openai.AsyncOpenAI client, model_info)
         - client: OpenAI-compatible client configured for the selected provider
-        - model_info: Dictionary with model information
+        - model_info: ModelInfo with model and provider details
     """
     client = None
 
     try:
         if provider_name:
             # Legacy mode: find provider by name and use default model
-            providers = await model_provider_service.get_all_providers()
-            provider = next((p for p in providers if p.name == provider_name), None)
+            provider = await _get_provider_by_name(provider_name)
             
             if not provider:
                 raise ValueError(f"Provider '{provider_name}' not found")
             
             # Get default model for the provider
             model_type = "embedding" if use_embedding_provider else "chat"
-            models = await model_provider_service.get_provider_models(provider.id, model_type)
-            if not models:
+            model = await _get_default_provider_model(provider.id, model_type)
+            if not model:
                 raise ValueError(f"No {model_type} models found for provider '{provider_name}'")
             
-            model = next((m for m in models if m.is_default), models[0])
-            
         else:
             # Use selected providers
             if use_embedding_provider:
@@ -86,38 +125,33 @@ async def get_llm_client(provider_name: str | None = None, use_embedding_provide
                 model_type = "embedding" if use_embedding_provider else "chat"
                 raise ValueError(f"No {model_type} provider/model configured")
 
-        logger.info(f"Creating LLM client for provider: {provider.display_name}, model: {model.model_name}")
+        logger.info("Creating LLM client for provider: %s, model: %s", provider.display_name, model.model_name)
 
         # Validate API key if required
         if provider.requires_api_key and not provider.api_key:
             raise ValueError(f"API key required for provider {provider.display_name}")
 
-        # Create client
-        api_key = provider.api_key if provider.requires_api_key else "dummy"
-        base_url = provider.base_url
-
-        client = openai.AsyncOpenAI(
-            api_key=api_key,
-            base_url=base_url
+        # Get shared client (not closed on exit; it is reused by later calls)
+        client = model_provider_service.get_openai_client(
+            _client_api_key(provider), provider.base_url, provider.id
         )
 
-        # Prepare model info for backwards compatibility
-        model_info = {
-            "model_id": model.model_id,
-            "model_name": model.model_name,
-            "provider_name": provider.name,
-            "provider_display_name": provider.display_name,
-            "max_tokens": model.max_tokens,
-            "model_type": model.model_type
-        }
+        model_info = ModelInfo(
+            model.model_id,
+            model.model_name,
+            provider.name,
+            provider.display_name,
+            model.max_tokens,
+            model.model_type,
+        )
 
-        logger.info(f"Successfully created {model.model_type} client for {provider.display_name}/{model.model_name}")
+        logger.info(
+            "Successfully created %s client for %s/%s", model.model_type, provider.display_name, model.model_name
+        )
         yield client, model_info
 
     except Exception as e:
-        logger.error(
-            f"Error creating LLM client for provider {provider_name if provider_name else 'selected'}: {e}"
-        )
+        logger.error("Error creating LLM client for provider %s: %s", provider_name or "selected", e)
         raise
     finally:
         # Cleanup if needed
@@ -137,17 +171,15 @@ async def get_embedding_model(provider_name: str | None = None) -> str:
     try:
         if provider_name:
             # Legacy mode: find provider by name
-            providers = await model_provider_service.get_all_providers()
-            provider = next((p for p in providers if p.name == provider_name), None)
+            provider = await _get_provider_by_name(provider_name)
             
             if not provider:
                 # Fallback to default
-                logger.warning(f"Provider '{provider_name}' not found, using default")
+                logger.warning("Provider '%s' not found, using default", provider_name)
                 provider, model = await model_provider_service.get_selected_embedding_model()
             else:
                 # Get default embedding model for this provider
-                models = await model_provider_service.get_provider_models(provider.id, "embedding")
-                model = next((m for m in models if m.is_default), models[0] if models else None)
+                model = await _get_default_provider_model(provider.id, "embedding")
         else:
             # Use selected provider
             provider, model = await model_provider_service.get_selected_embedding_model()
@@ -155,15 +187,15 @@ async def get_embedding_model(provider_name: str | None = None) -> str:
         if not model:
             # Fallback to a default
             logger.warning("No embedding model configured, falling back to default")
-            return "text-embedding-3-small"
+            return _DEFAULT_EMBEDDING_MODEL
 
-        logger.info(f"Using embedding model: {model.model_name} from {provider.display_name}")
+        logger.info("Using embedding model: %s from %s", model.model_name, provider.display_name)
         return model.model_id
 
     except Exception as e:
-        logger.error(f"Error getting embedding model: {e}")
+        logger.error("Error getting embedding model: %s", e)
         # Fallback to OpenAI default
-        return "text-embedding-3-small"
+        return _DEFAULT_EMBEDDING_MODEL
 
 
 async def get_chat_model(provider_name: str | None = None) -> str:
@@ -179,17 +211,15 @@ async def get_chat_model(provider_name: str | None = None) -> str:
     try:
         if provider_name:
             # Legacy mode: find provider by name
-            providers = await model_provider_service.get_all_providers()
-            provider = next((p for p in providers if p.name == provider_name), None)
+            provider = await _get_provider_by_name(provider_name)
             
             if not provider:
                 # Fallback to default
-                logger.warning(f"Provider '{provider_name}' not found, using default")
+                logger.warning("Provider '%s' not found, using default", provider_name)
                 provider, model = await model_provider_service.get_selected_chat_model()
             else:
                 # Get default chat model for this provider
-                models = await model_provider_service.get_provider_models(provider.id, "chat")
-                model = next((m for m in models if m.is_default), models[0] if models else None)
+                model = await _get_default_provider_model(provider.id, "chat")
         else:
             # Use selected provider
             provider, model = await model_provider_service.get_selected_chat_model()
@@ -197,15 +227,15 @@ async def get_chat_model(provider_name: str | None = None) -> str:
         if not model:
             # Fallback to a default
             logger.warning("No chat model configured, falling back to default")
-            return "gpt-4"
+            return _DEFAULT_CHAT_MODEL
 
-        logger.info(f"Using chat model: {model.model_name} from {provider.display_name}")
+        logger.info("Using chat model: %s from %s", model.model_name, provider.display_name)
         return model.model_id
 
     except Exception as e:
-        logger.error(f"Error getting chat model: {e}")
+        logger.error("Error getting chat model: %s", e)
         # Fallback to OpenAI default
-        return "gpt-4"
+        return _DEFAULT_CHAT_MODEL
 
 
 # Backwards compatibility functions
@@ -228,7 +258,7 @@ async def get_active_provider_info(service_type: str = "chat") -> dict[str, Any]
         if not provider or not model:
             return {
                 "provider": "openai",
-                "model": "gpt-4" if service_type == "chat" else "text-embedding-3-small",
+                "model": _DEFAULT_CHAT_MODEL if service_type == "chat" else _DEFAULT_EMBEDDING_MODEL,
                 "base_url": None,
                 "has_api_key": False
             }
@@ -243,10 +273,10 @@ async def get_active_provider_info(service_type: str = "chat") -> dict[str, Any]
         }
         
     except Exception as e:
-        logger.error(f"Error getting active provider info: {e}")
+        logger.error("Error getting active provider info: %s", e)
         return {
             "provider": "openai",
-            "model": "gpt-4" if service_type == "chat" else "text-embedding-3-small",
+            "model": _DEFAULT_CHAT_MODEL if service_type == "chat" else _DEFAULT_EMBEDDING_MODEL,
             "base_url": None,
             "has_api_key": False
         }
\ No newline at end of file
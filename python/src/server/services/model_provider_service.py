@@ -8,10 +8,15 @@ Handles management of flexible model providers including:
 - Encrypting/decrypting API keys
 """
 
+import asyncio
+import functools
+import hashlib
+import time
 import uuid
-from contextlib import asynccontextmanager
-from typing import Any, Dict, List, Optional
-from dataclasses import dataclass, asdict
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional
+from dataclasses import dataclass, field
+import httpx
 import openai
 
 from ..config.logfire_config import get_logger
@@ -19,8 +24,40 @@ from .credential_service import credential_service
 
 logger = get_logger(__name__)
 
+# Settings keys holding the selected (provider ID, model ID) for each model type
+_SELECTED_MODEL_KEYS = {
+    "chat": ("SELECTED_CHAT_PROVIDER_ID", "SELECTED_CHAT_MODEL_ID"),
+    "embedding": ("SELECTED_EMBEDDING_PROVIDER_ID", "SELECTED_EMBEDDING_MODEL_ID"),
+}
+_SELECTED_CACHE_TTL_SECONDS = 60
+_PROVIDERS_CACHE_TTL_SECONDS = 30
 
-@dataclass
+# Connection pool for each cached OpenAI client. The httpx defaults (100 connections,
+# 20 keep-alive) queue requests when many LLM calls hit the same base_url;
+# HTTP/2 lets concurrent calls share one connection where the provider supports it.
+_CLIENT_POOL_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+_CLIENT_TIMEOUT = httpx.Timeout(600.0, connect=5.0)  # Long reads for slow completions, fail fast on connect
+
+# Shared read-only configuration for rows whose configuration column is empty;
+# it cannot be mutated in place, so one instance serves every such row
+_EMPTY_CONFIG: Mapping[str, Any] = MappingProxyType({})
+
+# Dataclass fields written straight through to their tables. api_key is stored
+# separately as api_key_encrypted, so it is not listed here.
+_PROVIDER_DB_COLUMNS = (
+    "id", "name", "display_name", "base_url", "requires_api_key",
+    "is_active", "provider_type", "description", "configuration",
+)
+_MODEL_DB_COLUMNS = (
+    "id", "provider_id", "model_id", "model_name", "model_type", "is_default", "is_active",
+    "max_tokens", "cost_per_token_input", "cost_per_token_output", "description", "configuration",
+)
+# Reads fetch only the columns the dataclasses map, not every column in the table
+_PROVIDER_SELECT = ",".join(_PROVIDER_DB_COLUMNS + ("api_key_encrypted",))
+_MODEL_SELECT = ",".join(_MODEL_DB_COLUMNS)
+
+
+@dataclass(slots=True)
 class ModelProvider:
     """Represents a model provider configuration."""
     id: str
@@ -32,14 +69,35 @@ class ModelProvider:
     is_active: bool = True
     provider_type: str = "openai_compatible"
     description: Optional[str] = None
-    configuration: Dict[str, Any] = None
-    
-    def __post_init__(self):
-        if self.configuration is None:
-            self.configuration = {}
+    configuration: Mapping[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def _from_row(cls, item: Dict[str, Any], decrypt: Callable[[str], Optional[str]]) -> "ModelProvider":
+        """Build a ModelProvider from an archon_model_providers row, decrypting its API key."""
+        get = item.get
+        api_key = None
+        api_key_encrypted = get("api_key_encrypted")
+        if api_key_encrypted:
+            try:
+                api_key = decrypt(api_key_encrypted)
+            except Exception as e:
+                logger.warning("Failed to decrypt API key for provider %s: %s", item["name"], e)
+        
+        return cls(
+            id=item["id"],
+            name=item["name"],
+            display_name=item["display_name"],
+            base_url=get("base_url"),
+            api_key=api_key,
+            requires_api_key=get("requires_api_key", True),
+            is_active=get("is_active", True),
+            provider_type=get("provider_type", "openai_compatible"),
+            description=get("description"),
+            configuration=get("configuration") or _EMPTY_CONFIG
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class ProviderModel:
     """Represents a model available from a provider."""
     id: str
@@ -53,11 +111,57 @@ class ProviderModel:
     cost_per_token_input: Optional[float] = None
     cost_per_token_output: Optional[float] = None
     description: Optional[str] = None
-    configuration: Dict[str, Any] = None
-    
-    def __post_init__(self):
-        if self.configuration is None:
-            self.configuration = {}
+    configuration: Mapping[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def _from_row(cls, item: Dict[str, Any]) -> "ProviderModel":
+        """Build a ProviderModel from an archon_provider_models row."""
+        get = item.get
+        # PostgREST already returns the numeric cost columns as JSON numbers
+        return cls(
+            id=item["id"],
+            provider_id=item["provider_id"],
+            model_id=item["model_id"],
+            model_name=item["model_name"],
+            model_type=item["model_type"],
+            is_default=get("is_default", False),
+            is_active=get("is_active", True),
+            max_tokens=get("max_tokens"),
+            cost_per_token_input=get("cost_per_token_input"),
+            cost_per_token_output=get("cost_per_token_output"),
+            description=get("description"),
+            configuration=get("configuration") or _EMPTY_CONFIG
+        )
+
+
+@functools.lru_cache(maxsize=256)
+def _decrypt_cached(cipher: str) -> str:
+    """Decrypt a stored provider API key, memoized by ciphertext.
+
+    Ciphertexts are immutable once stored, and every decrypt re-derives the
+    Fernet key with 100k PBKDF2 iterations, so provider reads skip it on a hit.
+    """
+    return credential_service._decrypt_value(cipher)
+
+
+def _client_api_key(provider: ModelProvider) -> str:
+    """API key to build a client with; keyless providers still need a placeholder for the SDK."""
+    return (provider.api_key or "") if provider.requires_api_key else "dummy"
+
+
+def _provider_payload(provider: ModelProvider) -> Dict[str, Any]:
+    """Build the archon_model_providers row for a provider, encrypting its API key."""
+    data = {column: getattr(provider, column) for column in _PROVIDER_DB_COLUMNS}
+    data["configuration"] = dict(provider.configuration)  # MappingProxyType is not JSON serializable
+    data["api_key_encrypted"] = credential_service._encrypt_value(provider.api_key) if provider.api_key else None
+    return data
+
+
+def _model_payload(model: ProviderModel) -> Dict[str, Any]:
+    """Build the archon_provider_models row for a model."""
+    data = {column: getattr(model, column) for column in _MODEL_DB_COLUMNS}
+    data["configuration"] = dict(model.configuration)  # MappingProxyType is not JSON serializable
+    return data
 
 
 class ModelProviderService:
@@ -65,440 +169,484 @@ class ModelProviderService:
 
     def __init__(self):
         self._supabase = None
+        # model_type -> (monotonic timestamp, (provider, model))
+        self._selected_cache: dict[str, tuple[float, tuple[Optional[ModelProvider], Optional[ProviderModel]]]] = {}
+        # include_inactive -> (monotonic timestamp, providers in display order)
+        self._providers_cache: dict[bool, tuple[float, List[ModelProvider]]] = {}
+        # model_type -> in-progress selected-model load that concurrent callers share
+        self._selected_inflight: dict[str, asyncio.Task] = {}
+        # model_type -> bumped on every invalidation so loads started earlier do not cache their result
+        self._selected_generation: dict[str, int] = {}
+        # provider ID -> (monotonic timestamp, provider), filled by list reads and point reads
+        self._providers_by_id: dict[str, tuple[float, ModelProvider]] = {}
+        # (base_url, sha256(api_key)) -> shared client, so connection pools and TLS sessions stay warm
+        self._openai_clients: dict[tuple[str, str], openai.AsyncOpenAI] = {}
+        # provider ID -> pool keys it has used, so a key rotation or delete can retire stale clients
+        self._provider_client_keys: dict[str, set[tuple[str, str]]] = {}
+        # Clients dropped from the pool that earlier callers may still hold; closed by close()
+        self._retired_clients: list[openai.AsyncOpenAI] = []
 
     def _get_supabase_client(self):
-        """Get Supabase client from credential service."""
-        return credential_service._get_supabase_client()
+        """Get the Supabase client, resolved from the credential service on first use."""
+        # Client creation is synchronous (no await), so concurrent coroutines
+        # cannot interleave here and no lock is needed to avoid double init.
+        if self._supabase is None:
+            self._supabase = credential_service._get_supabase_client()
+        return self._supabase
+
+    @staticmethod
+    def _client_key(api_key: str, base_url: Optional[str]) -> tuple[str, str]:
+        """Pool key for a client; the API key is hashed so plaintext never sits in the key."""
+        return (base_url or "", hashlib.sha256(api_key.encode("utf-8")).hexdigest())
+
+    def get_openai_client(
+        self, api_key: str, base_url: Optional[str], provider_id: Optional[str] = None
+    ) -> openai.AsyncOpenAI:
+        """
+        Get the shared OpenAI-compatible client for an API key and base URL.
+
+        Clients are created on first use and reused until close(), or until the
+        provider_id they were requested for is updated or deleted; callers must
+        not close them. A client retired by an update or delete stays open for
+        whoever still holds it and is closed by close(). Creation has no await, so concurrent callers cannot
+        race to build the same client.
+        """
+        key = self._client_key(api_key, base_url)
+        if provider_id:
+            self._provider_client_keys.setdefault(provider_id, set()).add(key)
+        client = self._openai_clients.get(key)
+        if client is None:
+            client = openai.AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=openai.DefaultAsyncHttpxClient(
+                    limits=_CLIENT_POOL_LIMITS,
+                    timeout=_CLIENT_TIMEOUT,
+                    http2=True,
+                ),
+            )
+            self._openai_clients[key] = client
+        return client
+
+    def _retire_provider_clients(self, provider_id: str, keep: Optional[tuple[str, str]] = None) -> None:
+        """Drop a provider's pooled clients, except `keep` and any still used by another provider.
+
+        Callers such as a running crawl may still hold a dropped client, so it is
+        not closed here; new callers get a fresh client and close() closes the old one.
+        """
+        keys = self._provider_client_keys.pop(provider_id, set())
+        if keep in keys:
+            self._provider_client_keys[provider_id] = {keep}
+        shared = set().union(*self._provider_client_keys.values())
+        for key in keys - shared:
+            client = self._openai_clients.pop(key, None)
+            if client is not None:
+                self._retired_clients.append(client)
+
+    async def close(self) -> None:
+        """Close all cached and retired OpenAI clients (called on application shutdown)."""
+        clients = [*self._openai_clients.values(), *self._retired_clients]
+        self._openai_clients.clear()
+        self._provider_client_keys.clear()
+        self._retired_clients.clear()
+        for client in clients:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning("Error closing OpenAI client: %s", e)
+
+    async def _execute(self, query):
+        """
+        Run a supabase-py query in a worker thread.
+
+        The Supabase client is synchronous, so calling execute() directly would
+        block the event loop for the whole database round-trip.
+        """
+        return await asyncio.to_thread(query.execute)
 
     async def get_all_providers(self, include_inactive: bool = False) -> List[ModelProvider]:
-        """Get all model providers."""
+        """Get all model providers, served from the providers cache when fresh."""
+        cached = self._providers_cache.get(include_inactive)
+        if cached is not None:
+            timestamp, providers = cached
+            if time.monotonic() - timestamp < _PROVIDERS_CACHE_TTL_SECONDS:
+                return list(providers)
+
+        supabase = self._get_supabase_client()
+        query = supabase.table("archon_model_providers").select(_PROVIDER_SELECT)
+        if not include_inactive:
+            query = query.eq("is_active", True)
+        
         try:
-            supabase = self._get_supabase_client()
-            
-            query = supabase.table("archon_model_providers").select("*")
-            if not include_inactive:
-                query = query.eq("is_active", True)
-            
-            result = query.order("display_name").execute()
-            
-            providers = []
-            for item in result.data:
-                # Decrypt API key if present
-                api_key = None
-                if item.get("api_key_encrypted"):
-                    try:
-                        api_key = credential_service._decrypt_value(item["api_key_encrypted"])
-                    except Exception as e:
-                        logger.warning(f"Failed to decrypt API key for provider {item['name']}: {e}")
-                
-                provider = ModelProvider(
-                    id=item["id"],
-                    name=item["name"],
-                    display_name=item["display_name"],
-                    base_url=item.get("base_url"),
-                    api_key=api_key,
-                    requires_api_key=item.get("requires_api_key", True),
-                    is_active=item.get("is_active", True),
-                    provider_type=item.get("provider_type", "openai_compatible"),
-                    description=item.get("description"),
-                    configuration=item.get("configuration", {})
-                )
-                providers.append(provider)
-            
-            logger.info(f"Retrieved {len(providers)} model providers")
-            return providers
-            
+            result = await self._execute(query.order("display_name"))
         except Exception as e:
-            logger.error(f"Error getting model providers: {e}")
+            logger.error("Error getting model providers: %s", e)
             raise
+        
+        # Decrypt failures are handled per row inside _from_row
+        from_row = ModelProvider._from_row
+        providers = [from_row(item, _decrypt_cached) for item in result.data]
+        
+        now = time.monotonic()
+        self._providers_cache[include_inactive] = (now, providers)
+        self._providers_by_id.update((provider.id, (now, provider)) for provider in providers)
+        
+        logger.info("Retrieved %d model providers", len(providers))
+        return list(providers)
 
     async def get_provider_by_id(self, provider_id: str) -> Optional[ModelProvider]:
-        """Get a specific provider by ID."""
+        """Get a specific provider by ID, served from the providers cache when fresh."""
+        cached = self._providers_by_id.get(provider_id)
+        if cached is not None:
+            timestamp, provider = cached
+            if time.monotonic() - timestamp < _PROVIDERS_CACHE_TTL_SECONDS:
+                return provider
+
+        supabase = self._get_supabase_client()
         try:
-            supabase = self._get_supabase_client()
-            result = supabase.table("archon_model_providers").select("*").eq("id", provider_id).execute()
-            
-            if not result.data:
-                return None
-            
-            item = result.data[0]
-            
-            # Decrypt API key if present
-            api_key = None
-            if item.get("api_key_encrypted"):
-                try:
-                    api_key = credential_service._decrypt_value(item["api_key_encrypted"])
-                except Exception as e:
-                    logger.warning(f"Failed to decrypt API key for provider {item['name']}: {e}")
-            
-            return ModelProvider(
-                id=item["id"],
-                name=item["name"],
-                display_name=item["display_name"],
-                base_url=item.get("base_url"),
-                api_key=api_key,
-                requires_api_key=item.get("requires_api_key", True),
-                is_active=item.get("is_active", True),
-                provider_type=item.get("provider_type", "openai_compatible"),
-                description=item.get("description"),
-                configuration=item.get("configuration", {})
-            )
-            
+            result = await self._execute(supabase.table("archon_model_providers").select(_PROVIDER_SELECT).eq("id", provider_id))
         except Exception as e:
-            logger.error(f"Error getting provider {provider_id}: {e}")
+            logger.error("Error getting provider %s: %s", provider_id, e)
+            raise
+        
+        if not result.data:
             return None
+        
+        provider = ModelProvider._from_row(result.data[0], _decrypt_cached)
+        self._providers_by_id[provider_id] = (time.monotonic(), provider)
+        return provider
 
-    async def create_provider(self, provider: ModelProvider) -> str:
-        """Create a new model provider."""
+    async def create_provider(self, provider: ModelProvider) -> ModelProvider:
+        """Create a new model provider and return it as stored."""
+        supabase = self._get_supabase_client()
+        
+        # Generate ID if not provided
+        if not provider.id:
+            provider.id = str(uuid.uuid4())
+        
         try:
-            supabase = self._get_supabase_client()
-            
-            # Generate ID if not provided
-            if not provider.id:
-                provider.id = str(uuid.uuid4())
-            
-            # Encrypt API key if provided
-            api_key_encrypted = None
-            if provider.api_key:
-                api_key_encrypted = credential_service._encrypt_value(provider.api_key)
-            
-            data = {
-                "id": provider.id,
-                "name": provider.name,
-                "display_name": provider.display_name,
-                "base_url": provider.base_url,
-                "api_key_encrypted": api_key_encrypted,
-                "requires_api_key": provider.requires_api_key,
-                "is_active": provider.is_active,
-                "provider_type": provider.provider_type,
-                "description": provider.description,
-                "configuration": provider.configuration
-            }
-            
-            result = supabase.table("archon_model_providers").insert(data).execute()
-            
-            logger.info(f"Created model provider: {provider.name}")
-            return provider.id
-            
+            data = _provider_payload(provider)
+            # PostgREST returns the inserted row, so no follow-up select is needed
+            result = await self._execute(supabase.table("archon_model_providers").insert(data))
         except Exception as e:
-            logger.error(f"Error creating provider: {e}")
+            logger.error("Error creating provider: %s", e)
             raise
+        
+        self._providers_cache.clear()
+        self._providers_by_id.clear()
+        self._invalidate_selected()
+        
+        logger.info("Created model provider: %s", provider.name)
+        # The stored ciphertext was just produced from provider.api_key, so reuse the plaintext
+        return ModelProvider._from_row(result.data[0], lambda _encrypted: provider.api_key)
 
     async def update_provider(self, provider: ModelProvider) -> bool:
         """Update an existing model provider."""
+        supabase = self._get_supabase_client()
         try:
-            supabase = self._get_supabase_client()
-            
-            # Encrypt API key if provided
-            api_key_encrypted = None
-            if provider.api_key:
-                api_key_encrypted = credential_service._encrypt_value(provider.api_key)
-            
-            data = {
-                "name": provider.name,
-                "display_name": provider.display_name,
-                "base_url": provider.base_url,
-                "api_key_encrypted": api_key_encrypted,
-                "requires_api_key": provider.requires_api_key,
-                "is_active": provider.is_active,
-                "provider_type": provider.provider_type,
-                "description": provider.description,
-                "configuration": provider.configuration
-            }
-            
-            supabase.table("archon_model_providers").update(data).eq("id", provider.id).execute()
-            
-            logger.info(f"Updated model provider: {provider.name}")
-            return True
-            
+            data = _provider_payload(provider)
+            del data["id"]
+            await self._execute(supabase.table("archon_model_providers").update(data).eq("id", provider.id))
         except Exception as e:
-            logger.error(f"Error updating provider {provider.id}: {e}")
+            logger.error("Error updating provider %s: %s", provider.id, e)
             return False
+        
+        # The old ciphertext is gone from the table; drop its cached plaintext too
+        _decrypt_cached.cache_clear()
+        self._providers_cache.clear()
+        self._providers_by_id.clear()
+        self._invalidate_selected()
+        # Retire clients built for the old key or base URL; a client matching the new settings stays pooled
+        self._retire_provider_clients(
+            provider.id, keep=self._client_key(_client_api_key(provider), provider.base_url)
+        )
+        
+        logger.info("Updated model provider: %s", provider.name)
+        return True
 
     async def delete_provider(self, provider_id: str) -> bool:
         """Delete a model provider."""
+        supabase = self._get_supabase_client()
         try:
-            supabase = self._get_supabase_client()
-            supabase.table("archon_model_providers").delete().eq("id", provider_id).execute()
-            
-            logger.info(f"Deleted model provider: {provider_id}")
-            return True
-            
+            await self._execute(supabase.table("archon_model_providers").delete().eq("id", provider_id))
         except Exception as e:
-            logger.error(f"Error deleting provider {provider_id}: {e}")
+            logger.error("Error deleting provider %s: %s", provider_id, e)
             return False
+        
+        _decrypt_cached.cache_clear()
+        self._providers_cache.clear()
+        self._providers_by_id.clear()
+        self._invalidate_selected()
+        self._retire_provider_clients(provider_id)
+        
+        logger.info("Deleted model provider: %s", provider_id)
+        return True
 
     async def get_provider_models(self, provider_id: str, model_type: Optional[str] = None, include_inactive: bool = False) -> List[ProviderModel]:
         """Get models for a specific provider."""
+        supabase = self._get_supabase_client()
+        query = supabase.table("archon_provider_models").select(_MODEL_SELECT).eq("provider_id", provider_id)
+        
+        if model_type:
+            query = query.eq("model_type", model_type)
+        
+        if not include_inactive:
+            query = query.eq("is_active", True)
+        
+        # Raise rather than return [] so callers do not mistake an outage for "no models"
+        try:
+            result = await self._execute(query.order("model_name"))
+        except Exception as e:
+            logger.error("Error getting models for provider %s: %s", provider_id, e)
+            raise
+        
+        models = [ProviderModel._from_row(item) for item in result.data]
+        
+        logger.info("Retrieved %d models for provider %s", len(models), provider_id)
+        return models
+
+    async def get_default_provider_model(self, provider_id: str, model_type: str) -> Optional[ProviderModel]:
+        """Get a provider's default active model of one type, or its first by name if none is flagged."""
+        supabase = self._get_supabase_client()
+        
+        # Let Postgres pick the row so at most one model comes back
+        query = (
+            supabase.table("archon_provider_models")
+            .select(_MODEL_SELECT)
+            .eq("provider_id", provider_id)
+            .eq("model_type", model_type)
+            .eq("is_active", True)
+            .order("is_default", desc=True)
+            .order("model_name")
+            .limit(1)
+        )
         try:
-            supabase = self._get_supabase_client()
-            
-            query = supabase.table("archon_provider_models").select("*").eq("provider_id", provider_id)
-            
-            if model_type:
-                query = query.eq("model_type", model_type)
-            
-            if not include_inactive:
-                query = query.eq("is_active", True)
-            
-            result = query.order("model_name").execute()
-            
-            models = []
-            for item in result.data:
-                model = ProviderModel(
-                    id=item["id"],
-                    provider_id=item["provider_id"],
-                    model_id=item["model_id"],
-                    model_name=item["model_name"],
-                    model_type=item["model_type"],
-                    is_default=item.get("is_default", False),
-                    is_active=item.get("is_active", True),
-                    max_tokens=item.get("max_tokens"),
-                    cost_per_token_input=float(item["cost_per_token_input"]) if item.get("cost_per_token_input") else None,
-                    cost_per_token_output=float(item["cost_per_token_output"]) if item.get("cost_per_token_output") else None,
-                    description=item.get("description"),
-                    configuration=item.get("configuration", {})
-                )
-                models.append(model)
-            
-            logger.info(f"Retrieved {len(models)} models for provider {provider_id}")
-            return models
-            
+            result = await self._execute(query)
         except Exception as e:
-            logger.error(f"Error getting models for provider {provider_id}: {e}")
-            return []
+            logger.error("Error getting default %s model for provider %s: %s", model_type, provider_id, e)
+            raise
+        
+        return ProviderModel._from_row(result.data[0]) if result.data else None
 
-    async def create_provider_model(self, model: ProviderModel) -> str:
-        """Create a new model for a provider."""
+    async def create_provider_model(self, model: ProviderModel) -> ProviderModel:
+        """Create a new model for a provider and return it as stored."""
+        supabase = self._get_supabase_client()
+        
+        # Generate ID if not provided
+        if not model.id:
+            model.id = str(uuid.uuid4())
+        
+        data = _model_payload(model)
+        
         try:
-            supabase = self._get_supabase_client()
-            
-            # Generate ID if not provided
-            if not model.id:
-                model.id = str(uuid.uuid4())
-            
-            data = {
-                "id": model.id,
-                "provider_id": model.provider_id,
-                "model_id": model.model_id,
-                "model_name": model.model_name,
-                "model_type": model.model_type,
-                "is_default": model.is_default,
-                "is_active": model.is_active,
-                "max_tokens": model.max_tokens,
-                "cost_per_token_input": model.cost_per_token_input,
-                "cost_per_token_output": model.cost_per_token_output,
-                "description": model.description,
-                "configuration": model.configuration
-            }
-            
-            result = supabase.table("archon_provider_models").insert(data).execute()
-            
-            logger.info(f"Created model: {model.model_name} for provider {model.provider_id}")
-            return model.id
-            
+            # PostgREST returns the inserted row, so no follow-up select is needed
+            result = await self._execute(supabase.table("archon_provider_models").insert(data))
         except Exception as e:
-            logger.error(f"Error creating model: {e}")
+            logger.error("Error creating model: %s", e)
             raise
+        
+        self._invalidate_selected()
+        
+        logger.info("Created model: %s for provider %s", model.model_name, model.provider_id)
+        return ProviderModel._from_row(result.data[0])
 
     async def update_provider_model(self, model: ProviderModel) -> bool:
         """Update an existing provider model."""
+        supabase = self._get_supabase_client()
+        
+        data = _model_payload(model)
+        # Models never move between providers; keep id and provider_id out of the SET list
+        del data["id"], data["provider_id"]
+        
         try:
-            supabase = self._get_supabase_client()
-            
-            data = {
-                "model_id": model.model_id,
-                "model_name": model.model_name,
-                "model_type": model.model_type,
-                "is_default": model.is_default,
-                "is_active": model.is_active,
-                "max_tokens": model.max_tokens,
-                "cost_per_token_input": model.cost_per_token_input,
-                "cost_per_token_output": model.cost_per_token_output,
-                "description": model.description,
-                "configuration": model.configuration
-            }
-            
-            supabase.table("archon_provider_models").update(data).eq("id", model.id).execute()
-            
-            logger.info(f"Updated model: {model.model_name}")
-            return True
-            
+            await self._execute(supabase.table("archon_provider_models").update(data).eq("id", model.id))
         except Exception as e:
-            logger.error(f"Error updating model {model.id}: {e}")
+            logger.error("Error updating model %s: %s", model.id, e)
             return False
+        
+        self._invalidate_selected()
+        
+        logger.info("Updated model: %s", model.model_name)
+        return True
 
     async def delete_provider_model(self, model_id: str) -> bool:
         """Delete a provider model."""
+        supabase = self._get_supabase_client()
         try:
-            supabase = self._get_supabase_client()
-            supabase.table("archon_provider_models").delete().eq("id", model_id).execute()
-            
-            logger.info(f"Deleted model: {model_id}")
-            return True
-            
+            await self._execute(supabase.table("archon_provider_models").delete().eq("id", model_id))
         except Exception as e:
-            logger.error(f"Error deleting model {model_id}: {e}")
+            logger.error("Error deleting model %s: %s", model_id, e)
             return False
+        
+        self._invalidate_selected()
+        
+        logger.info("Deleted model: %s", model_id)
+        return True
 
     async def get_selected_chat_model(self) -> tuple[Optional[ModelProvider], Optional[ProviderModel]]:
         """Get the currently selected chat model and its provider."""
-        try:
-            # Get selected provider and model IDs from settings
-            provider_id = await credential_service.get_credential("SELECTED_CHAT_PROVIDER_ID")
-            model_id = await credential_service.get_credential("SELECTED_CHAT_MODEL_ID")
-            
-            if not provider_id or not model_id:
-                # Fallback to first available chat model
-                return await self._get_default_model("chat")
-            
-            provider = await self.get_provider_by_id(provider_id)
-            if not provider:
-                return await self._get_default_model("chat")
-            
-            models = await self.get_provider_models(provider_id, "chat")
-            selected_model = next((m for m in models if m.model_id == model_id), None)
-            
-            if not selected_model:
-                return await self._get_default_model("chat")
-            
-            return provider, selected_model
-            
-        except Exception as e:
-            logger.error(f"Error getting selected chat model: {e}")
-            return await self._get_default_model("chat")
+        return await self._get_selected_model("chat")
 
     async def get_selected_embedding_model(self) -> tuple[Optional[ModelProvider], Optional[ProviderModel]]:
         """Get the currently selected embedding model and its provider."""
-        try:
-            # Get selected provider and model IDs from settings
-            provider_id = await credential_service.get_credential("SELECTED_EMBEDDING_PROVIDER_ID")
-            model_id = await credential_service.get_credential("SELECTED_EMBEDDING_MODEL_ID")
-            
-            if not provider_id or not model_id:
-                # Fallback to first available embedding model
-                return await self._get_default_model("embedding")
-            
-            provider = await self.get_provider_by_id(provider_id)
-            if not provider:
-                return await self._get_default_model("embedding")
-            
-            models = await self.get_provider_models(provider_id, "embedding")
-            selected_model = next((m for m in models if m.model_id == model_id), None)
-            
-            if not selected_model:
-                return await self._get_default_model("embedding")
-            
-            return provider, selected_model
-            
-        except Exception as e:
-            logger.error(f"Error getting selected embedding model: {e}")
-            return await self._get_default_model("embedding")
+        return await self._get_selected_model("embedding")
+
+    async def _get_selected_model(self, model_type: str) -> tuple[Optional[ModelProvider], Optional[ProviderModel]]:
+        """Get the selected model of a type, served from the selection cache when fresh."""
+        cached = self._selected_cache.get(model_type)
+        if cached is not None:
+            timestamp, selection = cached
+            if time.monotonic() - timestamp < _SELECTED_CACHE_TTL_SECONDS:
+                return selection
+
+        # Coalesce a burst of cache misses into one load instead of one per caller.
+        # The load runs as its own task, so a cancelled caller does not abort it for the rest.
+        task = self._selected_inflight.get(model_type)
+        if task is None:
+            task = asyncio.create_task(self._refresh_selected_model(model_type))
+            self._selected_inflight[model_type] = task
+            task.add_done_callback(lambda done: self._forget_inflight(model_type, done))
+        return await asyncio.shield(task)
+
+    async def _refresh_selected_model(self, model_type: str) -> tuple[Optional[ModelProvider], Optional[ProviderModel]]:
+        """Load the selected model of a type and cache it unless it was invalidated meanwhile."""
+        generation = self._selected_generation.get(model_type, 0)
+        selection = await self._load_selected_model(model_type)
+        if self._selected_generation.get(model_type, 0) == generation:
+            self._selected_cache[model_type] = (time.monotonic(), selection)
+        return selection
+
+    def _forget_inflight(self, model_type: str, task: asyncio.Task) -> None:
+        """Drop a finished load, unless an invalidation already replaced it with a newer one."""
+        if self._selected_inflight.get(model_type) is task:
+            del self._selected_inflight[model_type]
+
+    def _invalidate_selected(self, model_type: Optional[str] = None) -> None:
+        """
+        Invalidate the selection cache for one model type, or all types when None.
+
+        Loads already in flight are detached, so later callers start a fresh one,
+        and the generation bump keeps their stale result out of the cache.
+        """
+        model_types = (model_type,) if model_type else tuple(_SELECTED_MODEL_KEYS)
+        for key in model_types:
+            self._selected_generation[key] = self._selected_generation.get(key, 0) + 1
+            self._selected_cache.pop(key, None)
+            self._selected_inflight.pop(key, None)
+
+    async def _load_selected_model(self, model_type: str) -> tuple[Optional[ModelProvider], Optional[ProviderModel]]:
+        """Resolve the selected model of a type from settings, falling back to the default model."""
+        provider_key, model_key = _SELECTED_MODEL_KEYS[model_type]
+        # Get selected provider and model IDs from settings
+        selected = await credential_service.get_credentials([provider_key, model_key])
+        provider_id, model_id = selected[provider_key], selected[model_key]
+        
+        if not provider_id or not model_id:
+            # Fallback to first available model of this type
+            return await self._get_default_model(model_type)
+        
+        # Provider and model lookups are independent once the IDs are known.
+        # Query errors propagate: falling back here would only fire more queries
+        # at a failing database and cache the fallback as the selection.
+        provider, models = await asyncio.gather(
+            self.get_provider_by_id(provider_id),
+            self.get_provider_models(provider_id, model_type),
+        )
+        if not provider:
+            return await self._get_default_model(model_type)
+        
+        selected_model = next((m for m in models if m.model_id == model_id), None)
+        
+        if not selected_model:
+            return await self._get_default_model(model_type)
+        
+        return provider, selected_model
+
+    async def _get_all_models_of_type(self, model_type: str) -> List[ProviderModel]:
+        """Get active models of one type across all providers, defaults first."""
+        supabase = self._get_supabase_client()
+        query = (
+            supabase.table("archon_provider_models")
+            .select(_MODEL_SELECT)
+            .eq("model_type", model_type)
+            .eq("is_active", True)
+            .order("is_default", desc=True)
+            .order("model_name")
+        )
+        result = await self._execute(query)
+        return [ProviderModel._from_row(item) for item in result.data]
 
     async def _get_default_model(self, model_type: str) -> tuple[Optional[ModelProvider], Optional[ProviderModel]]:
         """Get the first available default model of the specified type."""
+        # Two queries in total instead of one model query per provider. Errors
+        # propagate so an outage is not cached as "no model available".
         try:
-            providers = await self.get_all_providers()
-            
-            for provider in providers:
-                models = await self.get_provider_models(provider.id, model_type)
-                default_model = next((m for m in models if m.is_default), None)
-                if default_model:
-                    return provider, default_model
-                # If no default, take first available
-                if models:
-                    return provider, models[0]
-            
-            return None, None
-            
+            providers, models = await asyncio.gather(
+                self.get_all_providers(),
+                self._get_all_models_of_type(model_type),
+            )
         except Exception as e:
-            logger.error(f"Error getting default {model_type} model: {e}")
-            return None, None
+            logger.error("Error getting default %s model: %s", model_type, e)
+            raise
+        
+        # Rows are ordered default-first then by name, so the first row
+        # seen for a provider is its default (or first available) model
+        best_by_provider: Dict[str, ProviderModel] = {}
+        for model in models:
+            best_by_provider.setdefault(model.provider_id, model)
+        
+        # Keep provider display order when picking among providers
+        for provider in providers:
+            best = best_by_provider.get(provider.id)
+            if best:
+                return provider, best
+        
+        return None, None
 
     async def set_selected_chat_model(self, provider_id: str, model_id: str) -> bool:
         """Set the selected chat model."""
-        try:
-            await credential_service.set_credential("SELECTED_CHAT_PROVIDER_ID", provider_id, category="rag_strategy")
-            await credential_service.set_credential("SELECTED_CHAT_MODEL_ID", model_id, category="rag_strategy")
-            logger.info(f"Set selected chat model: {provider_id}/{model_id}")
-            return True
-        except Exception as e:
-            logger.error(f"Error setting selected chat model: {e}")
-            return False
+        return await self._set_selected_model("chat", provider_id, model_id)
 
     async def set_selected_embedding_model(self, provider_id: str, model_id: str) -> bool:
         """Set the selected embedding model."""
-        try:
-            await credential_service.set_credential("SELECTED_EMBEDDING_PROVIDER_ID", provider_id, category="rag_strategy")
-            await credential_service.set_credential("SELECTED_EMBEDDING_MODEL_ID", model_id, category="rag_strategy")
-            logger.info(f"Set selected embedding model: {provider_id}/{model_id}")
-            return True
-        except Exception as e:
-            logger.error(f"Error setting selected embedding model: {e}")
-            return False
+        return await self._set_selected_model("embedding", provider_id, model_id)
+
+    async def _set_selected_model(self, model_type: str, provider_id: str, model_id: str) -> bool:
+        """Store the selected provider and model IDs for a model type in one settings write."""
+        provider_key, model_key = _SELECTED_MODEL_KEYS[model_type]
+        success = await credential_service.set_credentials(
+            {provider_key: provider_id, model_key: model_id}, category="rag_strategy"
+        )
+        self._invalidate_selected(model_type)
+        if success:
+            logger.info("Set selected %s model: %s/%s", model_type, provider_id, model_id)
+        return success
+
+    async def get_chat_client(self) -> tuple[openai.AsyncOpenAI, ProviderModel]:
+        """Get a shared OpenAI-compatible client for the selected chat model."""
+        return await self._get_client("chat")
 
-    @asynccontextmanager
-    async def get_chat_client(self):
-        """Get an OpenAI-compatible client for the selected chat model."""
-        provider, model = await self.get_selected_chat_model()
+    async def get_embedding_client(self) -> tuple[openai.AsyncOpenAI, ProviderModel]:
+        """Get a shared OpenAI-compatible client for the selected embedding model."""
+        return await self._get_client("embedding")
+
+    async def _get_client(self, model_type: str) -> tuple[openai.AsyncOpenAI, ProviderModel]:
+        """Resolve the selected model of a type and return the pooled client for its provider.
+
+        Clients come from the shared pool and must not be closed by callers.
+        """
+        provider, model = await self._get_selected_model(model_type)
         
         if not provider or not model:
-            raise ValueError("No chat model selected or available")
+            raise ValueError(f"No {model_type} model selected or available")
         
-        client = None
-        try:
-            if provider.requires_api_key and not provider.api_key:
-                raise ValueError(f"API key required for provider {provider.display_name}")
-            
-            api_key = provider.api_key if provider.requires_api_key else "dummy"
-            base_url = provider.base_url
-            
-            client = openai.AsyncOpenAI(
-                api_key=api_key,
-                base_url=base_url
-            )
-            
-            logger.info(f"Created chat client for {provider.display_name}/{model.model_name}")
-            yield client, model
-            
-        except Exception as e:
-            logger.error(f"Error creating chat client: {e}")
-            raise
-        finally:
-            # Cleanup if needed
-            pass
-
-    @asynccontextmanager
-    async def get_embedding_client(self):
-        """Get an OpenAI-compatible client for the selected embedding model."""
-        provider, model = await self.get_selected_embedding_model()
+        if provider.requires_api_key and not provider.api_key:
+            raise ValueError(f"API key required for provider {provider.display_name}")
         
-        if not provider or not model:
-            raise ValueError("No embedding model selected or available")
+        client = self.get_openai_client(_client_api_key(provider), provider.base_url, provider.id)
         
-        client = None
-        try:
-            if provider.requires_api_key and not provider.api_key:
-                raise ValueError(f"API key required for provider {provider.display_name}")
-            
-            api_key = provider.api_key if provider.requires_api_key else "dummy"
-            base_url = provider.base_url
-            
-            client = openai.AsyncOpenAI(
-                api_key=api_key,
-                base_url=base_url
-            )
-            
-            logger.info(f"Created embedding client for {provider.display_name}/{model.model_name}")
-            yield client, model
-            
-        except Exception as e:
-            logger.error(f"Error creating embedding client: {e}")
-            raise
-        finally:
-            # Cleanup if needed
-            pass
-
+        logger.info("Using %s client for %s/%s", model_type, provider.display_name, model.model_name)
+        return client, model
 
 # Global instance
 model_provider_service = ModelProviderService()
\ No newline at end of file
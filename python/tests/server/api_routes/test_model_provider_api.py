@@ -0,0 +1,174 @@
+"""Unit tests for the model provider API routes."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from postgrest.exceptions import APIError
+
+from src.server.services.model_provider_service import ModelProvider, ProviderModel
+
+PROVIDER = ModelProvider(id="p1", name="openai", display_name="OpenAI", api_key="sk-test")
+MODEL = ProviderModel(
+    id="m1", provider_id="p1", model_id="gpt-4", model_name="GPT-4", model_type="chat", is_default=True
+)
+
+
+@pytest.fixture
+def test_client():
+    """Create a test client for the model provider router."""
+    from fastapi import FastAPI
+    from src.server.api_routes.model_provider_api import router
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def mock_service():
+    """Patch the shared model provider service used by the routes."""
+    with patch("src.server.api_routes.model_provider_api.model_provider_service") as service:
+        yield service
+
+
+class TestSelectedModels:
+    """Tests for the current model selection endpoint."""
+
+    def test_selection_without_model_provider_tables_returns_nulls(self, test_client, mock_service):
+        """Test that a failing selection lookup reports no selection instead of a 500."""
+        missing = APIError({"message": 'relation "archon_model_providers" does not exist', "code": "42P01"})
+        mock_service.get_selected_chat_model = AsyncMock(side_effect=missing)
+        mock_service.get_selected_embedding_model = AsyncMock(side_effect=missing)
+
+        response = test_client.get("/api/model-providers/selection/current")
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "chat_provider": None,
+            "chat_model": None,
+            "embedding_provider": None,
+            "embedding_model": None,
+        }
+
+    def test_selection_unexpected_error_returns_500(self, test_client, mock_service):
+        """Test that failures other than a database query error are not masked as no selection."""
+        mock_service.get_selected_chat_model = AsyncMock(side_effect=TypeError("bad row"))
+        mock_service.get_selected_embedding_model = AsyncMock(return_value=(None, None))
+
+        response = test_client.get("/api/model-providers/selection/current")
+
+        assert response.status_code == 500
+
+    def test_selection_returns_selected_models(self, test_client, mock_service):
+        """Test that selected models are returned without API keys."""
+        mock_service.get_selected_chat_model = AsyncMock(return_value=(PROVIDER, MODEL))
+        mock_service.get_selected_embedding_model = AsyncMock(return_value=(None, None))
+
+        response = test_client.get("/api/model-providers/selection/current")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["chat_provider"]["id"] == "p1"
+        assert data["chat_provider"]["has_api_key"] is True
+        assert "api_key" not in data["chat_provider"]
+        assert data["chat_model"]["model_id"] == "gpt-4"
+        assert data["embedding_model"] is None
+
+
+class TestETagCaching:
+    """Tests for ETag handling on read endpoints."""
+
+    def test_providers_list_sets_etag(self, test_client, mock_service):
+        """Test that the provider list carries an ETag and revalidation headers."""
+        mock_service.get_all_providers = AsyncMock(return_value=[PROVIDER])
+
+        response = test_client.get("/api/model-providers/")
+
+        assert response.status_code == 200
+        assert response.headers["ETag"].startswith('"')
+        assert response.headers["Cache-Control"] == "no-cache, must-revalidate"
+        assert response.json()[0]["id"] == "p1"
+        assert "api_key" not in response.json()[0]
+
+    def test_matching_etag_returns_304(self, test_client, mock_service):
+        """Test that a matching If-None-Match returns an empty 304."""
+        mock_service.get_all_providers = AsyncMock(return_value=[PROVIDER])
+
+        etag = test_client.get("/api/model-providers/").headers["ETag"]
+        response = test_client.get("/api/model-providers/", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
+    def test_changed_data_changes_etag(self, test_client, mock_service):
+        """Test that a stale ETag gets the new body."""
+        mock_service.get_all_providers = AsyncMock(return_value=[PROVIDER])
+        etag = test_client.get("/api/model-providers/").headers["ETag"]
+
+        mock_service.get_all_providers = AsyncMock(return_value=[])
+        response = test_client.get("/api/model-providers/", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json() == []
+
+
+class TestProviderWithModels:
+    """Tests for the combined provider and models endpoint."""
+
+    def test_full_returns_provider_and_models(self, test_client, mock_service):
+        """Test that /full returns the provider and its models in one body."""
+        mock_service.get_provider_by_id = AsyncMock(return_value=PROVIDER)
+        mock_service.get_provider_models = AsyncMock(return_value=[MODEL])
+
+        response = test_client.get("/api/model-providers/p1/full?model_type=chat")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data) == {"provider", "models"}
+        assert data["provider"]["id"] == "p1"
+        assert [m["model_id"] for m in data["models"]] == ["gpt-4"]
+        assert "ETag" in response.headers
+        mock_service.get_provider_models.assert_awaited_once_with("p1", "chat", False)
+
+    def test_full_missing_provider_returns_404(self, test_client, mock_service):
+        """Test that /full reports an unknown provider as 404, not 500."""
+        mock_service.get_provider_by_id = AsyncMock(return_value=None)
+        mock_service.get_provider_models = AsyncMock(return_value=[])
+
+        response = test_client.get("/api/model-providers/missing/full")
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Provider not found"
+
+
+class TestTypeEndpoints:
+    """Tests for the static type list endpoints."""
+
+    @pytest.mark.parametrize(
+        "path, expected",
+        [
+            ("/api/model-providers/types/models", ["chat", "embedding"]),
+            ("/api/model-providers/types/providers", ["openai_compatible", "custom"]),
+        ],
+    )
+    def test_types_not_captured_by_provider_routes(self, test_client, mock_service, path, expected):
+        """Test that /types/* resolve to the type lists rather than /{provider_id}/models."""
+        mock_service.get_provider_models = AsyncMock(return_value=[MODEL])
+
+        response = test_client.get(path)
+
+        assert response.status_code == 200
+        assert response.json() == expected
+        assert response.headers["Cache-Control"] == "public, max-age=86400, immutable"
+        mock_service.get_provider_models.assert_not_called()
+
+    def test_types_matching_etag_returns_304(self, test_client):
+        """Test that the precomputed ETag revalidates."""
+        etag = test_client.get("/api/model-providers/types/models").headers["ETag"]
+
+        response = test_client.get("/api/model-providers/types/models", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
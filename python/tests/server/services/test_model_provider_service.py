@@ -0,0 +1,232 @@
+"""Unit tests for the model provider service caches."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.server.services.model_provider_service import ModelProvider, ModelProviderService, ProviderModel
+
+
+@pytest.fixture
+def service():
+    """Fresh service instance so cache state never leaks between tests."""
+    return ModelProviderService()
+
+
+class TestSelectedModelCache:
+    """Tests for the selected-model cache and its single-flight loads."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self, service):
+        """Test that a burst of cache misses triggers a single load per model type."""
+        calls = []
+
+        async def load(model_type):
+            calls.append(model_type)
+            await asyncio.sleep(0.01)
+            return ("provider", model_type)
+
+        service._load_selected_model = load
+
+        results = await asyncio.gather(*(service.get_selected_chat_model() for _ in range(10)))
+
+        assert calls == ["chat"]
+        assert all(result == ("provider", "chat") for result in results)
+        assert service._selected_inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_write_during_load_does_not_cache_stale_selection(self, service):
+        """Test that a load in flight when the selection changes cannot cache its old result."""
+        stored = {"model": "old"}
+
+        async def load(model_type):
+            value = stored["model"]
+            await asyncio.sleep(0.05)
+            return ("p1", value)
+
+        service._load_selected_model = load
+        slow_read = asyncio.create_task(service.get_selected_chat_model())
+        await asyncio.sleep(0.01)
+
+        with patch(
+            "src.server.services.model_provider_service.credential_service.set_credentials",
+            AsyncMock(return_value=True),
+        ):
+            assert await service.set_selected_chat_model("p1", "new") is True
+        stored["model"] = "new"
+
+        assert await service.get_selected_chat_model() == ("p1", "new")
+        assert await slow_read == ("p1", "old")
+        assert service._selected_cache["chat"][1] == ("p1", "new")
+
+
+class TestClientPool:
+    """Tests for retiring pooled OpenAI clients on provider writes."""
+
+    @pytest.fixture(autouse=True)
+    def stub_database(self, service):
+        """Make every query succeed without a database."""
+        with patch.object(service, "_get_supabase_client"), \
+             patch.object(service, "_execute", AsyncMock()), \
+             patch(
+                 "src.server.services.model_provider_service.credential_service._encrypt_value",
+                 return_value="encrypted",
+             ):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_update_with_new_key_retires_old_client(self, service):
+        """Test that rotating a provider's key hands new callers a new client."""
+        old_client = service.get_openai_client("sk-old", "https://api.example.com/v1", "p1")
+        old_client.close = AsyncMock()
+
+        provider = ModelProvider(
+            id="p1", name="example", display_name="Example",
+            base_url="https://api.example.com/v1", api_key="sk-new",
+        )
+        assert await service.update_provider(provider) is True
+
+        new_client = service.get_openai_client("sk-new", "https://api.example.com/v1", "p1")
+        assert new_client is not old_client
+        assert service.get_openai_client("sk-old", "https://api.example.com/v1") is not old_client
+
+        # Retired clients are closed at shutdown, not when the provider changes
+        old_client.close.assert_not_awaited()
+        await service.close()
+        old_client.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_held_client_survives_update(self, service):
+        """Test that a caller holding a client across a key rotation can keep using it."""
+        held = service.get_openai_client("sk-old", None, "p1")
+
+        provider = ModelProvider(id="p1", name="example", display_name="Example", api_key="sk-new")
+        assert await service.update_provider(provider) is True
+
+        assert not held._client.is_closed
+        await service.close()
+        assert held._client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_update_with_same_settings_keeps_client(self, service):
+        """Test that an update that leaves the key and base URL alone keeps the pooled client."""
+        client = service.get_openai_client("sk-same", "https://api.example.com/v1", "p1")
+
+        provider = ModelProvider(
+            id="p1", name="example", display_name="Example",
+            base_url="https://api.example.com/v1", api_key="sk-same",
+        )
+        assert await service.update_provider(provider) is True
+
+        assert service.get_openai_client("sk-same", "https://api.example.com/v1", "p1") is client
+        assert service._retired_clients == []
+
+    @pytest.mark.asyncio
+    async def test_delete_retires_clients_not_shared_with_other_providers(self, service):
+        """Test that deleting a provider retires its clients unless another provider uses them."""
+        own = service.get_openai_client("sk-own", None, "p1")
+        shared = service.get_openai_client("sk-shared", None, "p2")
+        assert service.get_openai_client("sk-shared", None, "p1") is shared
+
+        assert await service.delete_provider("p1") is True
+
+        assert service._retired_clients == [own]
+        assert service.get_openai_client("sk-shared", None, "p2") is shared
+        assert service.get_openai_client("sk-own", None) is not own
+
+PROVIDER = ModelProvider(id="p1", name="example", display_name="Example", api_key="sk-test")
+MODEL = ProviderModel(
+    id="m1", provider_id="p1", model_id="gpt-4", model_name="GPT-4", model_type="chat"
+)
+
+
+class TestWriteInvalidation:
+    """Tests that writes drop every cache that could serve the old data."""
+
+    @pytest.fixture(autouse=True)
+    def seeded(self, service):
+        """Fill the caches and make every query succeed without a database."""
+        service._providers_cache[False] = (0.0, [PROVIDER])
+        service._providers_by_id["p1"] = (0.0, PROVIDER)
+        service._selected_cache["chat"] = (0.0, (PROVIDER, MODEL))
+        service._selected_cache["embedding"] = (0.0, (None, None))
+        with patch.object(service, "_get_supabase_client"), \
+             patch.object(service, "_execute", AsyncMock()), \
+             patch(
+                 "src.server.services.model_provider_service.credential_service._encrypt_value",
+                 return_value="encrypted",
+             ):
+            yield
+
+    def assert_provider_caches_cleared(self, service):
+        assert service._providers_cache == {}
+        assert service._providers_by_id == {}
+        assert service._selected_cache == {}
+
+    @pytest.mark.asyncio
+    async def test_create_provider_clears_caches(self, service):
+        """Test that a new provider is visible on the next read."""
+        row = {"id": "p2", "name": "new", "display_name": "New", "api_key_encrypted": "encrypted"}
+        service._execute.return_value = SimpleNamespace(data=[row])
+
+        created = await service.create_provider(
+            ModelProvider(id="p2", name="new", display_name="New", api_key="sk-new")
+        )
+
+        assert created.api_key == "sk-new"
+        self.assert_provider_caches_cleared(service)
+
+    @pytest.mark.asyncio
+    async def test_update_provider_clears_caches(self, service):
+        """Test that an updated provider is re-read rather than served from cache."""
+        assert await service.update_provider(PROVIDER) is True
+        self.assert_provider_caches_cleared(service)
+
+    @pytest.mark.asyncio
+    async def test_delete_provider_clears_caches(self, service):
+        """Test that a deleted provider can no longer be served from cache."""
+        assert await service.delete_provider("p1") is True
+        self.assert_provider_caches_cleared(service)
+
+    @pytest.mark.asyncio
+    async def test_failed_provider_update_keeps_caches(self, service):
+        """Test that a failed write leaves the still-valid caches alone."""
+        service._execute.side_effect = Exception("Database connection failed")
+
+        assert await service.update_provider(PROVIDER) is False
+
+        assert service._providers_by_id["p1"][1] is PROVIDER
+        assert "chat" in service._selected_cache
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("write", ["create", "update", "delete"])
+    async def test_model_writes_clear_selected_cache(self, service, write):
+        """Test that model writes drop cached selections but keep the provider caches."""
+        service._execute.return_value = SimpleNamespace(data=[{
+            "id": "m1", "provider_id": "p1", "model_id": "gpt-4",
+            "model_name": "GPT-4", "model_type": "chat",
+        }])
+
+        if write == "create":
+            await service.create_provider_model(MODEL)
+        elif write == "update":
+            assert await service.update_provider_model(MODEL) is True
+        else:
+            assert await service.delete_provider_model("m1") is True
+
+        assert service._selected_cache == {}
+        assert service._providers_by_id["p1"][1] is PROVIDER
+
+    @pytest.mark.asyncio
+    async def test_set_selected_model_clears_only_that_type(self, service):
+        """Test that changing the chat selection keeps the cached embedding selection."""
+        with patch(
+            "src.server.services.model_provider_service.credential_service.set_credentials",
+            AsyncMock(return_value=True),
+        ):
+            assert await service.set_selected_chat_model("p1", "m1") is True
+
+        assert "chat" not in service._selected_cache
+        assert "embedding" in service._selected_cache
@@ -191,6 +191,91 @@ class TestAsyncCredentialService:
                 # Should have encrypted the value
                 credential_service._encrypt_value.assert_called_once_with("secret_value")
 
+    @pytest.mark.asyncio
+    async def test_set_credentials_single_upsert(self, mock_supabase_client):
+        """Test setting several credentials with one upsert"""
+        mock_client, mock_table = mock_supabase_client
+        credential_service._rag_settings_cache = {"stale": True}
+
+        with patch.object(credential_service, "_get_supabase_client", return_value=mock_client):
+            result = await credential_service.set_credentials(
+                {"SELECTED_CHAT_PROVIDER_ID": "p1", "SELECTED_CHAT_MODEL_ID": "gpt-4"},
+                category="rag_strategy",
+            )
+
+        assert result is True
+        mock_table.upsert.assert_called_once()
+        rows = mock_table.upsert.call_args.args[0]
+        assert mock_table.upsert.call_args.kwargs == {"on_conflict": "key"}
+        assert rows == [
+            {
+                "key": "SELECTED_CHAT_PROVIDER_ID",
+                "value": "p1",
+                "encrypted_value": None,
+                "is_encrypted": False,
+                "category": "rag_strategy",
+                "description": None,
+            },
+            {
+                "key": "SELECTED_CHAT_MODEL_ID",
+                "value": "gpt-4",
+                "encrypted_value": None,
+                "is_encrypted": False,
+                "category": "rag_strategy",
+                "description": None,
+            },
+        ]
+
+        # Cache reflects the write and RAG settings are re-read next time
+        assert credential_service._cache["SELECTED_CHAT_PROVIDER_ID"] == "p1"
+        assert credential_service._cache["SELECTED_CHAT_MODEL_ID"] == "gpt-4"
+        assert credential_service._rag_settings_cache is None
+
+    @pytest.mark.asyncio
+    async def test_set_credentials_failure_leaves_cache_untouched(self, mock_supabase_client):
+        """Test that a failed bulk upsert reports False and does not update the cache"""
+        mock_client, mock_table = mock_supabase_client
+        mock_table.upsert.return_value.execute.side_effect = Exception("Database connection failed")
+
+        with patch.object(credential_service, "_get_supabase_client", return_value=mock_client):
+            result = await credential_service.set_credentials({"SELECTED_CHAT_MODEL_ID": "gpt-4"})
+
+        assert result is False
+        assert "SELECTED_CHAT_MODEL_ID" not in credential_service._cache
+
+    @pytest.mark.asyncio
+    async def test_get_credentials_reads_cache(self):
+        """Test reading several credentials at once from the cache"""
+        credential_service._cache = {
+            "SELECTED_CHAT_PROVIDER_ID": "p1",
+            "SECRET": {"encrypted_value": "encrypted", "is_encrypted": True},
+        }
+        credential_service._cache_initialized = True
+
+        with patch.object(credential_service, "_decrypt_value", return_value="decrypted"):
+            result = await credential_service.get_credentials(
+                ["SELECTED_CHAT_PROVIDER_ID", "SECRET", "MISSING"], default="fallback"
+            )
+
+        assert result == {
+            "SELECTED_CHAT_PROVIDER_ID": "p1",
+            "SECRET": "decrypted",
+            "MISSING": "fallback",
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_credentials_loads_cache_once(self):
+        """Test that a cold cache is loaded once for the whole batch"""
+        async def load():
+            credential_service._cache = {"A": "1", "B": "2"}
+            credential_service._cache_initialized = True
+
+        with patch.object(credential_service, "load_all_credentials", side_effect=load) as mock_load:
+            result = await credential_service.get_credentials(["A", "B"])
+
+        assert result == {"A": "1", "B": "2"}
+        mock_load.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_load_all_credentials(self, mock_supabase_client, sample_credentials_data):
         """Test loading all credentials from database"""
@@ -312,6 +397,54 @@ class TestAsyncCredentialService:
             assert "provider" in result
             assert "api_key" in result
 
+    @pytest.mark.asyncio
+    async def test_get_active_provider_without_model_provider_tables(self, mock_supabase_client):
+        """Test fallback to settings-based config when the model provider tables are missing"""
+        from src.server.services.model_provider_service import model_provider_service
+
+        mock_client, mock_table = mock_supabase_client
+
+        credential_service._cache = {
+            "LLM_PROVIDER": "openai",
+            "MODEL_CHOICE": "gpt-4.1-nano",
+            "OPENAI_API_KEY": {
+                "encrypted_value": "encrypted_key",
+                "is_encrypted": True,
+                "category": "api_keys",
+                "description": "API key",
+            },
+        }
+        credential_service._cache_initialized = True
+
+        rag_response = MagicMock()
+        rag_response.data = [
+            {"key": "LLM_PROVIDER", "value": "openai", "is_encrypted": False},
+            {"key": "MODEL_CHOICE", "value": "gpt-4.1-nano", "is_encrypted": False},
+        ]
+        mock_table.select().eq().execute.return_value = rag_response
+
+        # Every provider/model query fails the way PostgREST does for an unknown table
+        missing_query = MagicMock()
+        for method in ("select", "eq", "order", "limit"):
+            getattr(missing_query, method).return_value = missing_query
+        missing_query.execute.side_effect = Exception('relation "archon_model_providers" does not exist')
+        missing_client = MagicMock()
+        missing_client.table.return_value = missing_query
+
+        with patch.object(credential_service, "_get_supabase_client", return_value=mock_client):
+            with patch.object(credential_service, "_decrypt_value", return_value="decrypted_key"):
+                with patch.object(model_provider_service, "_get_supabase_client", return_value=missing_client):
+                    with patch.dict(model_provider_service._selected_cache, clear=True):
+                        with patch.dict(model_provider_service._providers_cache, clear=True):
+                            llm = await credential_service.get_active_provider("llm")
+                            embedding = await credential_service.get_active_provider("embedding")
+
+        # Settings-based config, not the env-var-only last resort
+        assert llm["provider"] == "openai"
+        assert llm["api_key"] == "decrypted_key"
+        assert llm["chat_model"] == "gpt-4.1-nano"
+        assert embedding["api_key"] == "decrypted_key"
+
     @pytest.mark.asyncio
     async def test_initialize_credentials(self, mock_supabase_client, sample_credentials_data):
         """Test initialize_credentials function"""